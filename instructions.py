@@ -1,44 +1,59 @@
 from binaryninja import InstructionTextToken, InstructionTextTokenType
-import struct
+import functools
 
 # Type 1 instructions are those that take two operands.
-TYPE1_INSTRUCTIONS = [
+TYPE1_INSTRUCTIONS = frozenset({
     'mov', 'add', 'addc', 'subc', 'sub', 'cmp',
     'dadd', 'bit', 'bic', 'bis', 'xor', 'and'
-]
+})
 
 # Type 2 instructions are those that take one operand.
-TYPE2_INSTRUCTIONS = [
+TYPE2_INSTRUCTIONS = frozenset({
     'rrc', 'swpb', 'rra', 'sxt', 'push', 'call',
     'reti', 'br'
-]
+})
 
 # Type 3 instructions are (un)conditional branches. They do not
 # take any operands, as the branch targets are always immediates
 # stored in the instruction itself.
-TYPE3_INSTRUCTIONS = [
+TYPE3_INSTRUCTIONS = frozenset({
     'jnz', 'jz', 'jlo', 'jhs', 'jn', 'jge', 'jl',
     'jmp'
-]
+})
+
+# InstructionTypes maps every mnemonic to its instruction type, so
+# the decoder only has to do a single lookup.
+InstructionTypes = {
+    **{mnemonic: 1 for mnemonic in TYPE1_INSTRUCTIONS},
+    **{mnemonic: 2 for mnemonic in TYPE2_INSTRUCTIONS},
+    **{mnemonic: 3 for mnemonic in TYPE3_INSTRUCTIONS},
+}
 
-InstructionNames = [
-    # No instructions use opcode 0
-    None,
+# InstructionNames is a flat table indexed by (opcode << 3) | subopcode,
+# where the opcode is the top 4 bits of the instruction and the
+# subopcode is picked out with InstructionMask and InstructionMaskShift.
+# Unused slots are None.
+InstructionNames = [None] * 0x80
 
-    # Type 2 instructions all start with 0x1 but then
-    # differentiate by three more bits:
-    # 0001 00 XXX .......
-    ['rrc', 'swpb', 'rra', 'sxt', 'push', 'call', 'reti'],
+# No instructions use opcode 0
 
-    # Type 3 instructions start with either 0x2 or 0x3 and
-    # then differentiate with the following three bits:
-    # 0010 XXX ..........
-    ['jnz', 'jz', 'jlo', 'jhs'],
-    # 0011 XXX ..........
-    ['jn', 'jge', 'jl', 'jmp'],
+# Type 2 instructions all start with 0x1 but then
+# differentiate by three more bits:
+# 0001 00 XXX .......
+InstructionNames[0x08:0x0f] = [
+    'rrc', 'swpb', 'rra', 'sxt', 'push', 'call', 'reti'
+]
+
+# Type 3 instructions start with either 0x2 or 0x3 and
+# then differentiate with the following three bits:
+# 0010 XXX ..........
+InstructionNames[0x10:0x14] = ['jnz', 'jz', 'jlo', 'jhs']
+# 0011 XXX ..........
+InstructionNames[0x18:0x1c] = ['jn', 'jge', 'jl', 'jmp']
 
-    # Type 1 instructions all use the top 4 bits
-    # for their opcodes (0x4 - 0xf)
+# Type 1 instructions all use the top 4 bits
+# for their opcodes (0x4 - 0xf)
+InstructionNames[0x20::0x08] = [
     'mov',
     'add',
     'addc',
@@ -53,20 +68,19 @@ InstructionNames = [
     'and'
 ]
 
+# Nothing modifies the table after this point.
+InstructionNames = tuple(InstructionNames)
+
 # InstructionMask and InstructionMaskShift are used to mask
 # off the bits that are used for the opcode of type 2 and 3
-# instructions.
-InstructionMask = {
-    1: 0x380,
-    2: 0xc00,
-    3: 0xc00,
-}
+# instructions. Both are indexed by opcode; type 1 opcodes
+# (0x4 - 0xf) have no subopcode.
+InstructionMask = (0, 0x380, 0xc00, 0xc00)
 
-InstructionMaskShift = {
-    1: 7,
-    2: 10,
-    3: 10
-}
+InstructionMaskShift = (0, 7, 10, 10)
+
+# The longest instructions have two extension words.
+MAX_INSTRUCTION_LENGTH = 6
 
 # Some instructions can be either 2 byte (word) or 1 byte
 # operations.
@@ -90,7 +104,7 @@ CONSTANT_MODE4 = 10
 CONSTANT_MODE8 = 11
 CONSTANT_MODE_NEG1 = 12
 OFFSET = 13
-OperandLengths = [
+OperandLengths = (
     0,  # REGISTER_MODE
     2,  # INDEXED_MODE
     0,  # INDIRECT_REGISTER_MODE
@@ -105,9 +119,29 @@ OperandLengths = [
     0,  # CONSTANT_MODE8
     0,  # CONSTANT_MODE_NEG1
     0,  # OFFSET
-]
+)
+
+# Source operands using pc, sr or cg have special meanings for some
+# of the addressing modes. SourceModes maps those (register number,
+# mode) pairs to the mode they actually stand for.
+SourceModes = {
+    (0, INDEXED_MODE): SYMBOLIC_MODE,
+    (0, INDIRECT_AUTOINCREMENT_MODE): IMMEDIATE_MODE,
+    (2, INDEXED_MODE): ABSOLUTE_MODE,
+    (2, INDIRECT_REGISTER_MODE): CONSTANT_MODE4,
+    (2, INDIRECT_AUTOINCREMENT_MODE): CONSTANT_MODE8,
+    (3, REGISTER_MODE): CONSTANT_MODE0,
+    (3, INDEXED_MODE): CONSTANT_MODE1,
+    (3, INDIRECT_REGISTER_MODE): CONSTANT_MODE2,
+    (3, INDIRECT_AUTOINCREMENT_MODE): CONSTANT_MODE_NEG1,
+}
 
-Registers = [
+# The same for destination operands, where only indexed sr is special.
+DestModes = {
+    (2, INDEXED_MODE): ABSOLUTE_MODE,
+}
+
+Registers = (
     'pc',
     'sp',
     'sr',
@@ -124,68 +158,112 @@ Registers = [
     'r13',
     'r14',
     'r15'
-]
+)
+
+TextTokenType = InstructionTextTokenType.TextToken
+RegisterTokenType = InstructionTextTokenType.RegisterToken
+IntegerTokenType = InstructionTextTokenType.IntegerToken
+PossibleAddressTokenType = InstructionTextTokenType.PossibleAddressToken
+CodeRelativeAddressTokenType = (
+    InstructionTextTokenType.CodeRelativeAddressToken)
+
+# Tokens that never change are built once and shared by every
+# instruction.
+AT_TOKEN = InstructionTextToken(TextTokenType, '@')
+PLUS_TOKEN = InstructionTextToken(TextTokenType, '+')
+COMMA_TOKEN = InstructionTextToken(TextTokenType, ',')
+AMPERSAND_TOKEN = InstructionTextToken(TextTokenType, '&')
+OPEN_PAREN_TOKEN = InstructionTextToken(TextTokenType, '(')
+CLOSE_PAREN_TOKEN = InstructionTextToken(TextTokenType, ')')
+
+RegisterTokens = {
+    reg: InstructionTextToken(RegisterTokenType, reg)
+    for reg in Registers
+}
 
-OperandTokens = [
-    lambda reg, value: [    # REGISTER_MODE
-        InstructionTextToken(InstructionTextTokenType.RegisterToken, reg)
-    ],
-    lambda reg, value: [    # INDEXED_MODE
-        InstructionTextToken(
-            InstructionTextTokenType.IntegerToken, hex(value), value),
-        InstructionTextToken(InstructionTextTokenType.TextToken, '('),
-        InstructionTextToken(InstructionTextTokenType.RegisterToken, reg),
-        InstructionTextToken(InstructionTextTokenType.TextToken, ')')
-    ],
-    lambda reg, value: [    # INDIRECT_REGISTER_MODE
-        InstructionTextToken(InstructionTextTokenType.TextToken, '@'),
-        InstructionTextToken(InstructionTextTokenType.RegisterToken, reg)
-    ],
-    lambda reg, value: [    # INDIRECT_AUTOINCREMENT_MODE
-        InstructionTextToken(InstructionTextTokenType.TextToken, '@'),
-        InstructionTextToken(InstructionTextTokenType.RegisterToken, reg),
-        InstructionTextToken(InstructionTextTokenType.TextToken, '+')
-    ],
-    lambda reg, value: [    # SYMBOLIC_MODE
-        InstructionTextToken(
-            InstructionTextTokenType.CodeRelativeAddressToken, hex(value), value)
-    ],
-    lambda reg, value: [    # ABSOLUTE_MODE
-        InstructionTextToken(InstructionTextTokenType.TextToken, '&'),
-        InstructionTextToken(
-            InstructionTextTokenType.PossibleAddressToken, hex(value), value)
-    ],
-    lambda reg, value: [    # IMMEDIATE_MODE
-        InstructionTextToken(
-            InstructionTextTokenType.PossibleAddressToken, hex(value), value)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE0
-        InstructionTextToken(InstructionTextTokenType.IntegerToken, str(0), 0)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE1
-        InstructionTextToken(InstructionTextTokenType.IntegerToken, str(1), 1)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE2
-        InstructionTextToken(InstructionTextTokenType.IntegerToken, str(2), 2)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE4
-        InstructionTextToken(InstructionTextTokenType.IntegerToken, str(4), 4)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE8
-        InstructionTextToken(InstructionTextTokenType.IntegerToken, str(8), 8)
-    ],
-    lambda reg, value: [    # CONSTANT_MODE_NEG1
-        InstructionTextToken(
-            InstructionTextTokenType.IntegerToken, str(-1), -1)
-    ],
-    lambda reg, value: [    # OFFSET
-        InstructionTextToken(
-            InstructionTextTokenType.PossibleAddressToken, hex(value), value)
-    ]
-]
+ConstantTokens = {
+    value: InstructionTextToken(IntegerTokenType, str(value), value)
+    for value in (0, 1, 2, 4, 8, -1)
+}
+
+# The padded mnemonic token for every mnemonic and operand width. Type 3
+# instructions and instructions without operands have no width.
+MnemonicTokens = {
+    (mnemonic, width): InstructionTextToken(
+        TextTokenType,
+        '{:7s}'.format(mnemonic + '.b' if width == 1 else mnemonic))
+    for mnemonic in [*InstructionTypes, 'ret', 'dint']
+    for width in (1, 2, None)
+}
 
+# OperandFormats describes how each operand mode is rendered, as
+# (prefix, value token type, infix, has register, suffix). The value
+# token is left out if its type is None, and the register token goes
+# between the infix and the suffix.
+OperandFormats = (
+    ((), None, (), True, ()),  # REGISTER_MODE
+    (   # INDEXED_MODE
+        (),
+        IntegerTokenType,
+        (OPEN_PAREN_TOKEN,),
+        True,
+        (CLOSE_PAREN_TOKEN,)
+    ),
+    ((AT_TOKEN,), None, (), True, ()),  # INDIRECT_REGISTER_MODE
+    ((AT_TOKEN,), None, (), True, (PLUS_TOKEN,)),  # INDIRECT_AUTOINCREMENT_MODE
+    (   # SYMBOLIC_MODE
+        (), CodeRelativeAddressTokenType, (), False, ()
+    ),
+    (   # ABSOLUTE_MODE
+        (AMPERSAND_TOKEN,),
+        PossibleAddressTokenType,
+        (),
+        False,
+        ()
+    ),
+    (   # IMMEDIATE_MODE
+        (), PossibleAddressTokenType, (), False, ()
+    ),
+    ((ConstantTokens[0],), None, (), False, ()),  # CONSTANT_MODE0
+    ((ConstantTokens[1],), None, (), False, ()),  # CONSTANT_MODE1
+    ((ConstantTokens[2],), None, (), False, ()),  # CONSTANT_MODE2
+    ((ConstantTokens[4],), None, (), False, ()),  # CONSTANT_MODE4
+    ((ConstantTokens[8],), None, (), False, ()),  # CONSTANT_MODE8
+    ((ConstantTokens[-1],), None, (), False, ()),  # CONSTANT_MODE_NEG1
+    (   # OFFSET
+        (), PossibleAddressTokenType, (), False, ()
+    ),
+)
+
+
+# Operand values are 16-bit and the same ones show up over and over, so
+# their hex strings are cached rather than formatted every time.
+hex_string = functools.lru_cache(maxsize=0x10000)(hex)
+
+
+def emit_operand_tokens(tokens, mode, reg, value):
+    """Append the tokens for an operand to tokens."""
+    prefix, value_type, infix, has_register, suffix = OperandFormats[mode]
+
+    tokens += prefix
+
+    if value_type is not None:
+        tokens.append(
+            InstructionTextToken(value_type, hex_string(value), value))
+
+    tokens += infix
+
+    if has_register:
+        tokens.append(RegisterTokens[reg])
+
+    tokens += suffix
 
 class Operand:
+    # Operands are created for every decoded instruction, and many are
+    # shared with DecodeTable, so they are kept as small as possible and
+    # must not be modified once decoded.
+    __slots__ = ('mode', 'target', 'width', 'value', 'operand_length')
+
     def __init__(
         self,
         mode,
@@ -194,209 +272,219 @@ class Operand:
         value=None,
         operand_length=0
     ):
-        self._mode = mode
-        self._width = width
-        self._target = target
-        self._value = value
-        self._length = operand_length
-
-    @property
-    def mode(self):
-        return self._mode
-    
-    @property
-    def width(self):
-        return self._width
-
-    @property
-    def target(self):
-        return self._target
-
-    @property
-    def value(self):
-        return self._value
-
-    @value.setter
-    def value(self, v):
-        self._value = v
-
-    @property
-    def operand_length(self):
-        return self._length
-
-class SourceOperand(Operand):
-    @classmethod
-    def decode(cls, instr_type, instruction, address):
-        if instr_type == 3:
-            mode = OFFSET
-            target = None
-            width = None
-        else:
-            width = 1 if (instruction & 0x40) >> 6 else 2
-
-            # As is in the same place for Type 1 and 2 instructions
-            mode = (instruction & 0x30) >> 4
-
-        if instr_type == 2:
-            target = Registers[instruction & 0xf]
-        elif instr_type == 1:
-            target = Registers[(instruction & 0xf00) >> 8]
-        
-        if target == 'pc':
-            if mode == INDEXED_MODE:
-                mode = SYMBOLIC_MODE
-            elif mode == INDIRECT_AUTOINCREMENT_MODE:
-                mode = IMMEDIATE_MODE
-        elif target == 'cg':
-            if mode == REGISTER_MODE:
-                mode = CONSTANT_MODE0
-            elif mode == INDEXED_MODE:
-                mode = CONSTANT_MODE1
-            elif mode == INDIRECT_REGISTER_MODE:
-                mode = CONSTANT_MODE2
-            else:
-                mode = CONSTANT_MODE_NEG1
-        elif target == 'sr':
-            if mode == INDEXED_MODE:
-                mode = ABSOLUTE_MODE
-            elif mode == INDIRECT_REGISTER_MODE:
-                mode = CONSTANT_MODE4
-            elif mode == INDIRECT_AUTOINCREMENT_MODE:
-                mode = CONSTANT_MODE8
-
-        operand_length = OperandLengths[mode]
-
-        if instr_type == 3:
-            branch_target = (instruction & 0x3ff) << 1
-
-            # check if it's a negative offset
-            if branch_target & 0x600:
-                branch_target |= 0xf800
-                branch_target -= 0x10000
-
-            value = address + 2 + branch_target
-
-            return cls(mode, target, width, value, operand_length)
-        else:
-            return cls(mode, target, width, operand_length=operand_length)
-
-class DestOperand(Operand):
-    @classmethod
-    def decode(cls, instr_type, instruction, address):
-        if instr_type != 1:
-            return None
+        self.mode = mode
+        self.width = width
+        self.target = target
+        self.value = value
+        self.operand_length = operand_length
 
-        width = 1 if (instruction & 0x40) >> 6 else 2
-        target = Registers[instruction & 0xf]
-        mode = (instruction & 0x80) >> 7
 
-        if target == 'sr' and mode == INDEXED_MODE:
-                mode = ABSOLUTE_MODE
+def decode_source(instruction, register):
+    """Decode the source operand of a Type 1 or 2 instruction."""
+    width = 1 if (instruction & 0x40) >> 6 else 2
 
-        operand_length = OperandLengths[mode]
+    # As is in the same place for Type 1 and 2 instructions
+    mode = (instruction & 0x30) >> 4
 
-        return cls(mode, target, width, operand_length=operand_length)
+    mode = SourceModes.get((register, mode), mode)
 
-class Instruction:
-    @classmethod
-    def decode(cls, data, address):
-        if len(data) < 2:
-            return None
+    return Operand(
+        mode,
+        Registers[register],
+        width,
+        operand_length=OperandLengths[mode]
+    )
+
+
+def decode_type1(mnemonic, instruction):
+    src = decode_source(instruction, (instruction & 0xf00) >> 8)
+
+    dst_register = instruction & 0xf
+    dst_mode = (instruction & 0x80) >> 7
+
+    dst_mode = DestModes.get((dst_register, dst_mode), dst_mode)
+
+    dst = Operand(
+        dst_mode,
+        Registers[dst_register],
+        src.width,
+        operand_length=OperandLengths[dst_mode]
+    )
 
-        emulated = False
+    length = 2 + src.operand_length + dst.operand_length
 
-        instruction = struct.unpack('<H', data[0:2])[0]
+    # emulated instructions
+    emulated = False
 
-        # emulated instructions
-        if instruction == 0x4130:
-            return cls('ret', emulated=True)
+    if mnemonic == 'mov' and dst_register == 0:
+        mnemonic = 'br'
+        emulated = True
 
-        opcode = (instruction & 0xf000) >> 12
+    return mnemonic, 1, src, dst, length, emulated
 
-        mask = InstructionMask.get(opcode)
-        shift = InstructionMaskShift.get(opcode)
 
-        if None not in (mask, shift):
-            mnemonic = InstructionNames[opcode][(instruction & mask) >> shift]
-        else:
-            mnemonic = InstructionNames[opcode]
+def decode_type2(mnemonic, instruction):
+    src = decode_source(instruction, instruction & 0xf)
 
-        if mnemonic is None:
-            return None
+    return mnemonic, 2, src, None, 2 + src.operand_length, False
 
-        if mnemonic in TYPE1_INSTRUCTIONS:
-            type_ = 1
-        elif mnemonic in TYPE2_INSTRUCTIONS:
-            type_ = 2
-        elif mnemonic in TYPE3_INSTRUCTIONS:
-            type_ = 3
 
-        src = SourceOperand.decode(type_, instruction, address)
+def decode_type3(mnemonic, instruction):
+    # The offset is a signed 10-bit word count. Flipping the sign bit and
+    # subtracting it again sign extends it.
+    branch_target = (((instruction & 0x3ff) << 1) ^ 0x400) - 0x400
 
-        dst = DestOperand.decode(type_, instruction, address)
+    src = Operand(OFFSET, value=2 + branch_target)
 
-        length = 2 + src.operand_length + (dst.operand_length if dst else 0)
+    return mnemonic, 3, src, None, 2, False
 
-        if len(data) < length:
-            return None
 
-        offset = 2
-        if src.operand_length:
-            src.value = struct.unpack('<H', data[offset:offset+2])[0]
-            offset += 2
-        if dst and dst.operand_length:
-            dst.value = struct.unpack('<H', data[offset:offset+2])[0]
+# The operand decoding for each instruction type, indexed by type - 1.
+TypeDecoders = (decode_type1, decode_type2, decode_type3)
 
-        # emulated instructions
-        if mnemonic == 'mov' and dst.target == 'pc':
-            mnemonic = 'br'
-            emulated = True
 
-        elif (
-            mnemonic == 'bis' and
-            dst.target == 'sr' and
-            src.value == 0xf0
-        ):
-            return cls('dint', length=length, emulated=True)
+def decode_word(instruction):
+    """Decode everything that only depends on the first instruction word.
 
+    Returns a (mnemonic, type_, src, dst, length, emulated) tuple, or None
+    if the word is not a valid instruction. Operands that carry an extension
+    word are templates whose value still has to be filled in, and Type 3
+    branch targets are relative to the address of the instruction.
+    """
+    # emulated instructions
+    if instruction == 0x4130:
+        return 'ret', None, None, None, 2, True
+
+    opcode = (instruction & 0xf000) >> 12
+
+    # Type 1 instructions make up most of the opcode space and have
+    # no subopcode, so they are checked first.
+    if opcode >= 4:
+        mnemonic = InstructionNames[opcode << 3]
+    else:
+        mask = InstructionMask[opcode]
+        shift = InstructionMaskShift[opcode]
+
+        mnemonic = InstructionNames[
+            (opcode << 3) | ((instruction & mask) >> shift)]
+
+    if mnemonic is None:
+        return None
+
+    return TypeDecoders[InstructionTypes[mnemonic] - 1](mnemonic, instruction)
+
+
+# The decoding of the first word is the same everywhere, so it is done
+# once for every possible word up front. This costs about 14 MB and a
+# few tenths of a second when the plugin is loaded.
+DecodeTable = tuple(decode_word(instruction) for instruction in range(0x10000))
+
+
+@functools.lru_cache(maxsize=4096)
+def decode_bytes(data):
+    """Decode the instruction at the start of data, ignoring its address.
+
+    Returns an Instruction, or None if data does not start with a valid
+    instruction. As with decode_word, Type 3 branch targets are relative
+    to the address of the instruction. The result is cached and shared
+    between callers, so data has to be hashable and the returned
+    Instruction must not be modified.
+    """
+    if len(data) < 2:
+        return None
+
+    instruction = data[0] | (data[1] << 8)
+
+    entry = DecodeTable[instruction]
+
+    if entry is None:
+        return None
+
+    mnemonic, type_, src, dst, length, emulated = entry
+
+    if len(data) < length:
+        return None
+
+    # Operands without an extension word are shared with the decode
+    # table, everything else gets its own copy. The source extension
+    # word always directly follows the instruction word, and the
+    # destination extension word is always the last one.
+    if src is not None and src.operand_length:
+        src = Operand(
+            src.mode,
+            src.target,
+            src.width,
+            data[2] | (data[3] << 8),
+            src.operand_length
+        )
+    if dst and dst.operand_length:
+        dst = Operand(
+            dst.mode,
+            dst.target,
+            dst.width,
+            data[length - 2] | (data[length - 1] << 8),
+            dst.operand_length
+        )
+
+    # emulated instructions
+    if (
+        mnemonic == 'bis' and
+        dst.target == 'sr' and
+        src.value == 0xf0
+    ):
+        return Instruction('dint', length=length, emulated=True)
+
+    return Instruction(mnemonic, type_, src, dst, length, emulated)
+
+
+class Instruction:
+    __slots__ = (
+        'mnemonic', 'type', 'src', 'dst', 'length', 'emulated', 'tokens'
+    )
+
+    @classmethod
+    def decode(cls, data, address):
+        instr = decode_bytes(bytes(data[:MAX_INSTRUCTION_LENGTH]))
+
+        if instr is None or instr.type != 3:
+            return instr
+
+        # Only Type 3 instructions depend on their address, so they are
+        # the only ones that aren't shared.
         return cls(
-            mnemonic,
-            type_,
-            src,
-            dst,
-            length,
-            emulated
+            instr.mnemonic,
+            instr.type,
+            Operand(OFFSET, value=address + instr.src.value),
+            instr.dst,
+            instr.length,
+            instr.emulated
         )
 
     def generate_tokens(self):
-        tokens = []
+        # The tokens only depend on the decoded fields, and decoded
+        # instructions are shared, so they are built the first time the
+        # instruction is rendered and copied after that.
+        if self.tokens is None:
+            self.tokens = tuple(self._build_tokens())
 
-        mnemonic = self.mnemonic
-        type_ = self.type
-        src = self.src
-        dst = self.dst
+        return list(self.tokens)
 
-        if src is not None and src.width == 1:
-            mnemonic += '.b'
+    def _build_tokens(self):
+        src = self.src
 
-        tokens = [
-            InstructionTextToken(
-                InstructionTextTokenType.TextToken, '{:7s}'.format(mnemonic))
-        ]
+        if src is None:
+            return [MnemonicTokens[self.mnemonic, None]]
 
-        if type_ == 1:
-            tokens += OperandTokens[src.mode](src.target, src.value)
+        tokens = [MnemonicTokens[self.mnemonic, src.width]]
 
-            tokens += [InstructionTextToken(
-                InstructionTextTokenType.TextToken, ',')]
+        emit_operand_tokens(tokens, src.mode, src.target, src.value)
 
-            tokens += OperandTokens[dst.mode](dst.target, dst.value)
+        if self.type == 1:
+            dst = self.dst
 
-        elif type_ == 2:
-            tokens += OperandTokens[src.mode](src.target, src.value)
+            tokens.append(COMMA_TOKEN)
 
-        elif type_ == 3:
-            tokens += OperandTokens[src.mode](src.target, src.value)
+            emit_operand_tokens(tokens, dst.mode, dst.target, dst.value)
 
         return tokens
 
@@ -415,3 +503,4 @@ class Instruction:
         self.length = length
         self.emulated = emulated
         self.type = type_
+        self.tokens = None
@@ -1,4 +1,5 @@
-from typing import Callable, List
+from functools import partial
+from typing import Callable, Dict
 from binaryninja import (
     LLIL_TEMP,
     Architecture,
@@ -11,70 +12,110 @@ from binaryninja import (
     RegisterType,
 )
 
-from .instructions import IMMEDIATE_MODE, INDIRECT_AUTOINCREMENT_MODE, REGISTER_MODE
+from .instructions import (
+    ABSOLUTE_MODE,
+    CONSTANT_MODE0,
+    CONSTANT_MODE1,
+    CONSTANT_MODE2,
+    CONSTANT_MODE4,
+    CONSTANT_MODE8,
+    CONSTANT_MODE_NEG1,
+    IMMEDIATE_MODE,
+    INDEXED_MODE,
+    INDIRECT_AUTOINCREMENT_MODE,
+    INDIRECT_REGISTER_MODE,
+    REGISTER_MODE,
+    SYMBOLIC_MODE,
+)
+
+
+def source_indirect(il, width, reg, value):
+    return il.load(width, il.reg(2, reg))
+
+
+def source_autoincrement(il, width, reg, increment):
+    # The register is incremented as soon as the operand is read, so this
+    # appends the increment itself and loads through a copy of the
+    # original value.
+    il.append(il.set_reg(2, LLIL_TEMP(0), il.reg(2, reg)))
+    il.append(
+        il.set_reg(2, reg, il.add(2, il.reg(2, LLIL_TEMP(0)), il.const(2, increment)))
+    )
+    return il.load(width, il.reg(2, LLIL_TEMP(0)))
+
+
+def source_symbolic(il, width, reg, value):
+    return il.load(width, il.add(2, il.reg(2, "pc"), il.const(2, value)))
+
+
+def source_absolute(il, width, reg, value):
+    return il.load(width, il.const_pointer(2, value))
+
+
+def source_constant(il, width, reg, value, constant):
+    return il.const(width, constant)
+
 
-SourceOperandsIL: List[
+# Register, indexed, immediate and autoincrement source operands are
+# lifted by Lifter.emit_source, every other mode goes through this table.
+SourceOperandsIL: Dict[
+    int,
     Callable[
         [LowLevelILFunction, int | None, RegisterType | None, int | None],
         ExpressionIndex,
-    ]
-] = [
-    # REGISTER_MODE
-    lambda il, width, reg, value: il.reg(width, reg),
-    # INDEXED_MODE
-    lambda il, width, reg, value: il.load(
-        width, il.add(2, il.reg(2, reg), il.const(2, value))
-    ),
-    # INDIRECT_REGISTER_MODE
-    lambda il, width, reg, value: il.load(width, il.reg(2, reg)),
-    # INDIRECT_AUTOINCREMENT_MODE
-    lambda il, width, reg, value: il.load(width, il.reg(2, reg)),
-    # SYMBOLIC_MODE
-    lambda il, width, reg, value: il.load(
-        width, il.add(2, il.reg(2, "pc"), il.const(2, value))
-    ),
-    # ABSOLUTE_MODE
-    lambda il, width, reg, value: il.load(width, il.const_pointer(2, value)),
-    # IMMEDIATE_MODE
-    lambda il, width, reg, value: il.const(width, value),
-    # CONSTANT_MODE0
-    lambda il, width, reg, value: il.const(width, 0),
-    # CONSTANT_MODE1
-    lambda il, width, reg, value: il.const(width, 1),
-    # CONSTANT_MODE2
-    lambda il, width, reg, value: il.const(width, 2),
-    # CONSTANT_MODE4
-    lambda il, width, reg, value: il.const(width, 4),
-    # CONSTANT_MODE8
-    lambda il, width, reg, value: il.const(width, 8),
-    # CONSTANT_MODE_NEG1
-    lambda il, width, reg, value: il.const(width, -1),
-]
-
-DestOperandsIL = [
-    # REGISTER_MODE
-    lambda il, width, reg, value, src: il.set_reg(2, reg, src),
-    # INDEXED_MODE
-    lambda il, width, reg, value, src: il.store(
-        width, il.add(2, il.reg(2, reg), il.const(2, value)), src
-    ),
-    # INDIRECT_REGISTER_MODE
-    lambda il, width, reg, value, src: il.unimplemented(),
-    # INDIRECT_AUTOINCREMENT_MODE
-    lambda il, width, reg, value, src: il.unimplemented(),
-    # SYMBOLIC_MODE
-    lambda il, width, reg, value, src: il.unimplemented(),
-    # ABSOLUTE_MODE
-    lambda il, width, reg, value, src: il.store(width, il.const_pointer(2, value), src),
-    # IMMEDIATE_MODE
-    lambda il, width, reg, value, src: il.store(width, il.const_pointer(2, value), src),
-]
-
-
-def cond_branch(il: LowLevelILFunction, cond: ExpressionIndex, dest: ExpressionIndex):
-    d = LowLevelILInstruction.create(il, dest)
+    ],
+] = {
+    INDIRECT_REGISTER_MODE: source_indirect,
+    SYMBOLIC_MODE: source_symbolic,
+    ABSOLUTE_MODE: source_absolute,
+    CONSTANT_MODE0: partial(source_constant, constant=0),
+    CONSTANT_MODE1: partial(source_constant, constant=1),
+    CONSTANT_MODE2: partial(source_constant, constant=2),
+    CONSTANT_MODE4: partial(source_constant, constant=4),
+    CONSTANT_MODE8: partial(source_constant, constant=8),
+    CONSTANT_MODE_NEG1: partial(source_constant, constant=-1),
+}
+
+
+def dest_unimplemented(il, width, reg, value, src):
+    return il.unimplemented()
+
+
+def dest_absolute(il, width, reg, value, src):
+    return il.store(width, il.const_pointer(2, value), src)
+
+
+# Register and indexed destination operands are lifted inline by
+# Lifter.emit_dest, every other mode goes through this table. Modes that
+# can't be written to, like the constant generator ones that show up as
+# the operand of single-operand instructions, are unimplemented.
+DestOperandsIL = {
+    INDIRECT_REGISTER_MODE: dest_unimplemented,
+    INDIRECT_AUTOINCREMENT_MODE: dest_unimplemented,
+    SYMBOLIC_MODE: dest_unimplemented,
+    ABSOLUTE_MODE: dest_absolute,
+    IMMEDIATE_MODE: dest_absolute,
+}
+
+
+# The architecture isn't registered yet when this module is imported, so
+# it is looked up on first use and cached from then on.
+_arch = None
+
+
+def msp430_arch() -> Architecture:
+    global _arch
 
-    t = il.get_label_for_address(Architecture["msp430"], d.constant)
+    if _arch is None:
+        _arch = Architecture["msp430"]
+
+    return _arch
+
+
+def cond_branch(il: LowLevelILFunction, cond: ExpressionIndex, dest: int):
+    arch = msp430_arch()
+
+    t = il.get_label_for_address(arch, dest)
 
     if t is None:
         # t is not an address in the current function scope.
@@ -85,7 +126,7 @@ def cond_branch(il: LowLevelILFunction, cond: ExpressionIndex, dest: ExpressionI
 
     f_label_found = True
 
-    f = il.get_label_for_address(Architecture["msp430"], il.current_address + 2)
+    f = il.get_label_for_address(arch, il.current_address + 2)
 
     if f is None:
         f = LowLevelILLabel()
@@ -98,18 +139,27 @@ def cond_branch(il: LowLevelILFunction, cond: ExpressionIndex, dest: ExpressionI
         # then a jump, rather than a goto, needs to be added to
         # the IL.
         il.mark_label(t)
-        il.append(il.jump(d.expr_index))
+        il.append(il.jump(il.const(2, dest)))
 
     if not f_label_found:
         il.mark_label(f)
 
 
+def jump_const(il: LowLevelILFunction, dest: int) -> ExpressionIndex:
+    label = il.get_label_for_address(msp430_arch(), dest)
+
+    if label is None:
+        return il.jump(il.const(2, dest))
+    else:
+        return il.goto(label)
+
+
 def jump(il: LowLevelILFunction, dest: ExpressionIndex) -> ExpressionIndex:
     d = LowLevelILInstruction.create(il, dest)
     label = None
 
     if d.operation == LowLevelILOperation.LLIL_CONST:
-        label = il.get_label_for_address(Architecture["msp430"], d.constant)
+        label = il.get_label_for_address(msp430_arch(), d.constant)
 
     if label is None:
         return il.jump(d.expr_index)
@@ -117,157 +167,185 @@ def jump(il: LowLevelILFunction, dest: ExpressionIndex) -> ExpressionIndex:
         return il.goto(label)
 
 
+# Instructions that lift to no IL at all.
+NoOperations = frozenset(("dint",))
+
+
 class Lifter:
     @classmethod
     def lift(cls, il, instr):
-        if hasattr(cls, "lift_" + instr.mnemonic):
-            getattr(cls, "lift_" + instr.mnemonic)(il, instr)
-        else:
-            il.append(il.unimplemented())
+        if instr.mnemonic in NoOperations:
+            return
+
+        cls.lifters.get(instr.mnemonic, cls.unimplemented)(il, instr)
 
     @staticmethod
-    def lift_type1(il, op, src, dst, flags=None):
-        left = SourceOperandsIL[src.mode](il, src.width, src.target, src.value)
+    def unimplemented(il, instr):
+        il.append(il.unimplemented())
 
-        right = SourceOperandsIL[dst.mode](il, dst.width, dst.target, dst.value)
+    @staticmethod
+    def emit_source(il, mode, width, reg, value, increment=None):
+        # Register, immediate and indexed operands make up most of real
+        # code, so they are handled here and everything else goes through
+        # the table.
+        if mode == REGISTER_MODE:
+            return il.reg(width, reg)
+        elif mode == IMMEDIATE_MODE:
+            return il.const(width, value)
+        elif mode == INDEXED_MODE:
+            return il.load(width, il.add(2, il.reg(2, reg), il.const(2, value)))
+        elif mode == INDIRECT_AUTOINCREMENT_MODE:
+            # The register moves by the width of the operand, which isn't
+            # the width it is read at when the caller overrides it.
+            return source_autoincrement(
+                il, width, reg, width if increment is None else increment
+            )
 
-        operation = op(src.width, left, right, flags=flags)
+        return SourceOperandsIL[mode](il, width, reg, value)
 
-        return operation
+    @staticmethod
+    def emit_dest(il, mode, width, reg, value, src):
+        if mode == REGISTER_MODE:
+            return il.set_reg(2, reg, src)
+        elif mode == INDEXED_MODE:
+            return il.store(width, il.add(2, il.reg(2, reg), il.const(2, value)), src)
+
+        return DestOperandsIL.get(mode, dest_unimplemented)(il, width, reg, value, src)
 
     @staticmethod
-    def autoincrement(il, src):
-        if src.mode == INDIRECT_AUTOINCREMENT_MODE:
-            il.append(
-                il.set_reg(
-                    2,
-                    src.target,
-                    il.add(src.width, il.reg(2, src.target), il.const(2, src.width)),
-                )
-            )
+    def binary_operation(il, op, src, dst, flags=None):
+        left = Lifter.emit_source(il, src.mode, src.width, src.target, src.value)
+
+        right = Lifter.emit_source(il, dst.mode, dst.width, dst.target, dst.value)
+
+        operation = op(src.width, left, right, flags=flags)
+
+        return operation
 
     @staticmethod
     def lift_add(il, instr):
-        add = Lifter.lift_type1(il, il.add, instr.src, instr.dst, flags="*")
+        add = Lifter.binary_operation(il, il.add, instr.src, instr.dst, flags="*")
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, add
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                add,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_addc(il, instr):
-        add = Lifter.lift_type1(il, il.add, instr.src, instr.dst, flags="*")
+        add = Lifter.binary_operation(il, il.add, instr.src, instr.dst, flags="*")
 
         addc = il.add(instr.src.width, add, il.flag("c"), flags="*")
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, addc
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                addc,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_and(il, instr):
-        and_expr = Lifter.lift_type1(il, il.and_expr, instr.src, instr.dst)
+        and_expr = Lifter.binary_operation(il, il.and_expr, instr.src, instr.dst)
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, and_expr
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                and_expr,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_bic(il, instr):
-        left = SourceOperandsIL[instr.dst.mode](
-            il, instr.dst.width, instr.dst.target, instr.dst.value
+        left = Lifter.emit_source(
+            il, instr.dst.mode, instr.dst.width, instr.dst.target, instr.dst.value
         )
 
         right = il.not_expr(
             2,
-            SourceOperandsIL[instr.src.mode](
-                il, instr.src.width, instr.src.target, instr.src.value
+            Lifter.emit_source(
+                il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
             ),
         )
 
         and_expr = il.and_expr(instr.src.width, left, right)
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, and_expr
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                and_expr,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_bis(il, instr):
-        bis = Lifter.lift_type1(il, il.or_expr, instr.src, instr.dst)
+        bis = Lifter.binary_operation(il, il.or_expr, instr.src, instr.dst)
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, bis
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                bis,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_bit(il, instr):
-        bit = Lifter.lift_type1(il, il.and_expr, instr.src, instr.dst)
+        bit = Lifter.binary_operation(il, il.and_expr, instr.src, instr.dst)
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, bit
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                bit,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_br(il, instr):
-        target = SourceOperandsIL[instr.src.mode](
-            il, instr.src.width, instr.src.target, instr.src.value
+        if instr.src.mode == IMMEDIATE_MODE:
+            il.append(jump_const(il, instr.src.value))
+            return
+
+        target = Lifter.emit_source(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
         )
 
         il.append(jump(il, target))
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_call(il, instr):
-        if instr.src.mode == INDIRECT_AUTOINCREMENT_MODE:
-            # autoincrement mode is special in that prior to making the call,
-            # the register needs to be incremented. This requires a temp register,
-            # so that the original value of the register can be preserved while
-            # the register is incremented prior to actually making the call.
-            temp_expr = il.set_reg(2, LLIL_TEMP(0), il.reg(2, instr.src.target))
-
-            call_expr = il.call(il.load(2, il.reg(2, LLIL_TEMP(0))))
-
-            inc_expr = il.set_reg(
-                2,
-                instr.src.target,
-                il.add(2, il.reg(2, instr.src.target), il.const(2, 2)),
-            )
-
-            il.append(temp_expr)
-            il.append(inc_expr)
-
-        elif instr.src.mode == IMMEDIATE_MODE:
+        if instr.src.mode == IMMEDIATE_MODE:
             call_expr = il.call(il.const_pointer(2, instr.src.value))
 
         else:
             call_expr = il.call(
-                SourceOperandsIL[instr.src.mode](
-                    il, 2, instr.src.target, instr.src.value
+                Lifter.emit_source(
+                    il, instr.src.mode, 2, instr.src.target, instr.src.value
                 )
             )
 
@@ -275,20 +353,14 @@ class Lifter:
 
     @staticmethod
     def lift_cmp(il, instr):
-        sub = Lifter.lift_type1(il, il.sub, instr.src, instr.dst, flags="*")
+        sub = Lifter.binary_operation(il, il.sub, instr.src, instr.dst, flags="*")
 
         il.append(sub)
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_dadd(il, instr):
         il.append(il.unimplemented())
 
-    @staticmethod
-    def lift_dint(il, instr):
-        pass
-
     @staticmethod
     def lift_hlt(il, instr):
         il.append(il.no_ret())
@@ -298,7 +370,7 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_SGE),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -306,7 +378,7 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_ULE),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -314,7 +386,7 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_SLT),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -322,19 +394,19 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_UGT),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
     def lift_jmp(il, instr):
-        il.append(jump(il, il.const(2, instr.src.value)))
+        il.append(jump_const(il, instr.src.value))
 
     @staticmethod
     def lift_jn(il, instr):
         cond_branch(
             il,
             il.compare_equal(0, il.flag("n"), il.const(0, 1)),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -342,7 +414,7 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_NE),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -350,7 +422,7 @@ class Lifter:
         cond_branch(
             il,
             il.flag_condition(LowLevelILFlagCondition.LLFC_E),
-            il.const(2, instr.src.value),
+            instr.src.value,
         )
 
     @staticmethod
@@ -363,41 +435,49 @@ class Lifter:
         ):
             return
 
-        src = SourceOperandsIL[instr.src.mode](
-            il, instr.src.width, instr.src.target, instr.src.value
+        src = Lifter.emit_source(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
         )
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, src
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                src,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_pop(il, instr):
         il.append(
-            DestOperandsIL[instr.src.mode](
-                il, instr.src.width, instr.src.target, instr.src.value, il.pop(2)
+            Lifter.emit_dest(
+                il,
+                instr.src.mode,
+                instr.src.width,
+                instr.src.target,
+                instr.src.value,
+                il.pop(2),
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_push(il, instr):
         il.append(
             il.push(
                 2,
-                SourceOperandsIL[instr.src.mode](
-                    il, instr.src.width, instr.src.target, instr.src.value
+                Lifter.emit_source(
+                    il,
+                    instr.src.mode,
+                    instr.src.width,
+                    instr.src.target,
+                    instr.src.value,
                 ),
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_ret(il, instr):
         il.append(il.ret(il.pop(2)))
@@ -409,28 +489,26 @@ class Lifter:
 
     @staticmethod
     def lift_rra(il, instr):
-        left = SourceOperandsIL[instr.src.mode](
-            il, instr.src.width, instr.src.target, instr.src.value
+        left = Lifter.emit_source(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
         )
 
         right = il.const(1, 1)
 
         rra = il.arith_shift_right(2, left, right, flags="cnz")
 
-        dst = DestOperandsIL[instr.src.mode](
-            il, instr.src.width, instr.src.target, instr.src.value, rra
+        dst = Lifter.emit_dest(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value, rra
         )
 
         il.append(dst)
 
         il.append(il.set_flag("v", il.const(0, 0)))
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_rrc(il, instr):
-        left = SourceOperandsIL[instr.src.mode](
-            il, instr.src.width, instr.src.target, instr.src.value
+        left = Lifter.emit_source(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
         )
 
         right = il.const(1, 1)
@@ -438,45 +516,68 @@ class Lifter:
         rrc = il.rotate_right_carry(2, left, right, il.flag("c"), flags="*")
 
         il.append(
-            DestOperandsIL[instr.src.mode](
-                il, instr.src.width, instr.src.target, instr.src.value, rrc
+            Lifter.emit_dest(
+                il,
+                instr.src.mode,
+                instr.src.width,
+                instr.src.target,
+                instr.src.value,
+                rrc,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_sub(il, instr):
-        sub = Lifter.lift_type1(il, il.sub, instr.dst, instr.src, flags="*")
+        # sub src, dst computes dst - src
+        left = Lifter.emit_source(
+            il, instr.dst.mode, instr.dst.width, instr.dst.target, instr.dst.value
+        )
+
+        right = Lifter.emit_source(
+            il, instr.src.mode, instr.src.width, instr.src.target, instr.src.value
+        )
+
+        sub = il.sub(instr.src.width, left, right, flags="*")
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, sub
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                sub,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_subc(il, instr):
-        sub = Lifter.lift_type1(il, il.sub, instr.src, instr.dst, flags="*")
+        sub = Lifter.binary_operation(il, il.sub, instr.src, instr.dst, flags="*")
 
         subc = il.sub(
             instr.src.width, sub, il.not_expr(instr.src.width, il.flag("c")), flags="*"
         )
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, subc
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                subc,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_swpb(il, instr):
-        left = SourceOperandsIL[instr.src.mode](
-            il, 2, instr.src.target, instr.src.value
+        left = Lifter.emit_source(
+            il,
+            instr.src.mode,
+            2,
+            instr.src.target,
+            instr.src.value,
+            increment=instr.src.width,
         )
 
         right = il.const(1, 8)
@@ -484,35 +585,50 @@ class Lifter:
         rotate = il.rotate_left(2, left, right)
 
         il.append(
-            DestOperandsIL[instr.src.mode](
-                il, 2, instr.src.target, instr.src.value, rotate
+            Lifter.emit_dest(
+                il, instr.src.mode, 2, instr.src.target, instr.src.value, rotate
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_sxt(il, instr):
-        src = SourceOperandsIL[instr.src.mode](il, 1, instr.src.target, instr.src.value)
+        src = Lifter.emit_source(
+            il,
+            instr.src.mode,
+            1,
+            instr.src.target,
+            instr.src.value,
+            increment=instr.src.width,
+        )
 
         sxt = il.sign_extend(2, src, flags="*")
 
         il.append(
-            DestOperandsIL[instr.src.mode](
-                il, 2, instr.src.target, instr.src.value, sxt
+            Lifter.emit_dest(
+                il, instr.src.mode, 2, instr.src.target, instr.src.value, sxt
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
-
     @staticmethod
     def lift_xor(il, instr):
-        xor = Lifter.lift_type1(il, il.xor_expr, instr.src, instr.dst, flags="*")
+        xor = Lifter.binary_operation(il, il.xor_expr, instr.src, instr.dst, flags="*")
 
         il.append(
-            DestOperandsIL[instr.dst.mode](
-                il, instr.dst.width, instr.dst.target, instr.dst.value, xor
+            Lifter.emit_dest(
+                il,
+                instr.dst.mode,
+                instr.dst.width,
+                instr.dst.target,
+                instr.dst.value,
+                xor,
             )
         )
 
-        Lifter.autoincrement(il, instr.src)
+
+# Lifter.lift dispatches through this table rather than building and
+# looking up the lift_* method name for every instruction.
+Lifter.lifters = {
+    name[len("lift_") :]: getattr(Lifter, name)
+    for name in dir(Lifter)
+    if name.startswith("lift_")
+}
@@ -1,3 +1,5 @@
+import functools
+
 from binaryninja import (
     Architecture,
     BranchType,
@@ -7,29 +9,51 @@ from binaryninja import (
     RegisterInfo,
 )
 
-from .instructions import TYPE3_INSTRUCTIONS, Instruction, Registers
+from .instructions import Instruction, MAX_INSTRUCTION_LENGTH, Registers
 from .lifter import Lifter
 
 
+# Every register is 16 bits wide and none of them overlap.
+RegisterInfos = {r: RegisterInfo(r, 2) for r in Registers}
+
+# The branch each unconditional control flow instruction adds. Every other
+# Type 3 instruction is a conditional jump.
+BranchTypes = {
+    "ret": BranchType.FunctionReturn,
+    "reti": BranchType.FunctionReturn,
+    "jmp": BranchType.UnconditionalBranch,
+    "br": BranchType.UnconditionalBranch,
+    "call": BranchType.CallDestination,
+}
+
+
+# Binary Ninja asks for the info, text and IL of every instruction, and
+# comes back to the same addresses whenever a function is reanalyzed, so
+# decoded instructions are cached by their bytes and address.
+@functools.lru_cache(maxsize=4096)
+def decode_cached(data, addr):
+    return Instruction.decode(data, addr)
+
+
 class MSP430(Architecture):
     name = "msp430"
     address_size = 2
     default_int_size = 2
-    global_regs = ["sr"]
+    global_regs = ("sr",)
     stack_pointer = "sp"
 
-    regs = {r: RegisterInfo(r, 2) for r in Registers}
+    regs = RegisterInfos
 
-    flags = ["v", "n", "c", "z"]
+    flags = ("v", "n", "c", "z")
 
     # The first flag write type is ignored currently.
     # See: https://github.com/Vector35/binaryninja-api/issues/513
-    flag_write_types = ["", "*", "cnv", "cnz"]
+    flag_write_types = ("", "*", "cnv", "cnz")
 
     flags_written_by_flag_write_type = {
-        "*": ["v", "n", "c", "z"],
-        "cnv": ["v", "n", "c"],
-        "cnz": ["c", "n", "z"],
+        "*": ("v", "n", "c", "z"),
+        "cnv": ("v", "n", "c"),
+        "cnz": ("c", "n", "z"),
     }
     flag_roles = {
         "c": FlagRole.CarryFlagRole,
@@ -39,20 +63,23 @@ class MSP430(Architecture):
     }
 
     flags_required_for_flag_condition = {
-        LowLevelILFlagCondition.LLFC_UGE: ['c'],
-        LowLevelILFlagCondition.LLFC_UGT: ['c'],
-        LowLevelILFlagCondition.LLFC_ULT: ['c'],
-        LowLevelILFlagCondition.LLFC_ULE: ['c'],
-        LowLevelILFlagCondition.LLFC_SGE: ['n', 'v'],
-        LowLevelILFlagCondition.LLFC_SLT: ['n', 'v'],
-        LowLevelILFlagCondition.LLFC_E: ['z'],
-        LowLevelILFlagCondition.LLFC_NE: ['z'],
-        LowLevelILFlagCondition.LLFC_NEG: ['n'],
-        LowLevelILFlagCondition.LLFC_POS: ['n']
+        LowLevelILFlagCondition.LLFC_UGE: ('c',),
+        LowLevelILFlagCondition.LLFC_UGT: ('c',),
+        LowLevelILFlagCondition.LLFC_ULT: ('c',),
+        LowLevelILFlagCondition.LLFC_ULE: ('c',),
+        LowLevelILFlagCondition.LLFC_SGE: ('n', 'v'),
+        LowLevelILFlagCondition.LLFC_SLT: ('n', 'v'),
+        LowLevelILFlagCondition.LLFC_E: ('z',),
+        LowLevelILFlagCondition.LLFC_NE: ('z',),
+        LowLevelILFlagCondition.LLFC_NEG: ('n',),
+        LowLevelILFlagCondition.LLFC_POS: ('n',)
     }
 
+    def decode_instruction(self, data, addr):
+        return decode_cached(bytes(data[:MAX_INSTRUCTION_LENGTH]), addr)
+
     def get_instruction_info(self, data, addr):
-        instr = Instruction.decode(data, addr)
+        instr = self.decode_instruction(data, addr)
 
         if instr is None:
             return None
@@ -61,20 +88,23 @@ class MSP430(Architecture):
         result.length = instr.length
 
         # Add branches
-        if instr.mnemonic in ["ret", "reti"]:
-            result.add_branch(BranchType.FunctionReturn)
-        elif instr.mnemonic in ["jmp", "br"] and instr.src.value is not None:
-            result.add_branch(BranchType.UnconditionalBranch, instr.src.value)
+        branch_type = BranchTypes.get(instr.mnemonic)
+        src = instr.src
+
+        if branch_type == BranchType.FunctionReturn:
+            result.add_branch(branch_type)
+        elif branch_type is not None:
+            target = src.value
+            if target is not None:
+                result.add_branch(branch_type, target)
         elif instr.type == 3:
-            result.add_branch(BranchType.TrueBranch, instr.src.value)
+            result.add_branch(BranchType.TrueBranch, src.value)
             result.add_branch(BranchType.FalseBranch, addr + 2)
-        elif instr.mnemonic == "call" and instr.src.value is not None:
-            result.add_branch(BranchType.CallDestination, instr.src.value)
 
         return result
 
     def get_instruction_text(self, data, addr):
-        instr = Instruction.decode(data, addr)
+        instr = self.decode_instruction(data, addr)
 
         if instr is None:
             return None
@@ -84,17 +114,20 @@ class MSP430(Architecture):
         return tokens, instr.length
 
     def get_instruction_low_level_il(self, data, addr, il):
-        instr = Instruction.decode(data, addr)
+        instr = self.decode_instruction(data, addr)
 
         if instr is None:
             return None
 
         # Halting the system means turning off interrupts and just looping
-        # indefinitely
+        # indefinitely, so check the next word for a jmp back to the dint
         if instr.mnemonic == "dint":
-            next_instr = Instruction.decode(data[instr.length :], addr + instr.length)
-            if next_instr.mnemonic == "jmp" and next_instr.src.value == addr:
-                instr.mnemonic = "hlt"
+            length = instr.length
+            jmp = 0x3c00 | ((-(length + 2) >> 1) & 0x3ff)
+            if bytes(data[length : length + 2]) == jmp.to_bytes(2, "little"):
+                # Decoded instructions are shared, so build a new one
+                # rather than renaming this one.
+                instr = Instruction("hlt", length=instr.length, emulated=True)
 
         Lifter.lift(il, instr)
 